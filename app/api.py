@@ -1,8 +1,7 @@
-# Force HF Hub to copy instead of symlinking on Windows
-import os
-
-os.environ["HF_HUB_DISABLE_SYMLINKS"] = "1"
-
+# HF Hub environment (symlinks, cache location) is set up by .pipeline
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
@@ -13,10 +12,30 @@ class ProcessRequest(BaseModel):
     video_url: HttpUrl
 
 
+# Inference runs in worker threads so it never blocks the event loop. Threads
+# (not processes) share the loaded models, and torch/CTranslate2 release the
+# GIL while they compute. The pool size bounds the pipeline runs in flight;
+# several overlap their downloads and share batched accent passes, while
+# the model work itself stays serialized (one CTranslate2 Whisper worker, one
+# accent batcher thread), so the cores aren't oversubscribed
+MAX_CONCURRENT_PIPELINES = 4
+executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_PIPELINES, thread_name_prefix="process-video"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """On shutdown, stop accepting new work and let in-flight requests finish"""
+    yield
+    executor.shutdown(wait=True)
+
+
 app = FastAPI(
     title="Accent Detection API",
     version="1.0",
     description="AI-powered accent detection from video URLs",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware for frontend compatibility
@@ -48,7 +67,10 @@ async def root():
 async def process_video(req: ProcessRequest):
     """Endpoint to process a video URL and return accent detection results"""
     try:
-        result = pipeline.process(str(req.video_url))
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor, pipeline.process, str(req.video_url)
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,29 +4,85 @@ import os
 os.environ["HF_HUB_DISABLE_SYMLINKS"] = "1"
 os.environ["HF_HUB_CACHE"] = os.path.abspath("./hf_cache")
 
-import tempfile
+# Whisper and ECAPA run side by side, so by default each OpenMP pool gets half
+# of the cores. Must be set before torch/CTranslate2 are imported
+DEFAULT_NUM_THREADS = max(1, (os.cpu_count() or 2) // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(DEFAULT_NUM_THREADS))
+
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Callable
 import traceback
-import whisper
+import numpy as np
+import torch
+from faster_whisper import WhisperModel
 from speechbrain.inference import EncoderClassifier
-from .utils import download_video, extract_audio
-import shutil
-from pathlib import Path
+from .batching import DynamicBatcher
+from .utils import (
+    SAMPLE_RATE,
+    AudioBufferPool,
+    AudioDecodeError,
+    LRUCache,
+    stream_audio,
+)
+
+try:
+    # OpenMP also accepts a per-level list ("4,2"), the outer level is ours
+    NUM_THREADS = max(1, int(os.environ["OMP_NUM_THREADS"].split(",")[0]))
+except ValueError:
+    NUM_THREADS = DEFAULT_NUM_THREADS  # e.g. an empty OMP_NUM_THREADS
+torch.set_num_threads(NUM_THREADS)
+try:
+    torch.set_num_interop_threads(2)
+except RuntimeError:
+    pass  # Inter-op pool already started (torch was used before this import)
+
+ACCENT_MODEL_REPO = "Jzuluaga/accent-id-commonaccent_ecapa"
 
 
 class AccentDetectionPipeline:
     def __init__(
-        self, whisper_model_size: str = "tiny"
+        self,
+        whisper_model_size: str = "tiny",
+        cache_size: int = 128,
+        quantize_accent_model: bool = True,
+        compile_accent_model: bool = False,
     ):  # Changed from "tiny" to "base"
         """Initialize and load models once"""
-        # Whisper for language detection
+        # Result caches: by URL (skips the download) and by audio content
+        # (skips both models when the same audio comes from another URL)
+        self.url_cache = LRUCache(cache_size)
+        self.audio_cache = LRUCache(cache_size)
+        self.buffer_pool = AudioBufferPool()
+
+        # Accent classification runs on the batcher's own thread, side by side
+        # with Whisper (NUM_THREADS each, see top). Concurrent requests that
+        # arrive within 20ms share one ECAPA forward pass
+        self._accent_batcher = DynamicBatcher(
+            self._detect_accent_batch,
+            max_batch_size=16,
+            max_wait=0.02,
+            name="accent-batcher",
+        )
+
+        # Whisper for language detection (CTranslate2 runtime, int8 weights)
         print("Loading Whisper model...")
-        self.whisper_model = whisper.load_model(whisper_model_size)
+        self.whisper_model = WhisperModel(
+            whisper_model_size,
+            device="auto",
+            compute_type="int8",
+            cpu_threads=NUM_THREADS,
+        )
         print("✓ Whisper loaded")
 
-        # SpeechBrain for accent classification
-        print("Loading SpeechBrain accent classifier...")
-        self._load_accent_classifier()
-        print("✓ Accent classifier loaded")
+        # SpeechBrain for accent classification, loaded on first use so
+        # non-English requests never pay for loading it. Once loaded, it runs
+        # speculatively next to Whisper on every clip (see process())
+        self._accent_classifier = None
+        self._accent_classifier_lock = threading.Lock()
+        self.quantize_accent_model = quantize_accent_model
+        self.compile_accent_model = compile_accent_model
 
         # Label mapping
         self.accent_mapping = {
@@ -48,92 +104,109 @@ class AccentDetectionPipeline:
             "southatlandtic": "South Atlantic",
         }
 
-    def _load_accent_classifier(self):
-        """Load accent classifier with Windows-compatible fallback"""
-        model_dir = Path("./pretrained_models/accent_ecapa")
-
-        # Try loading from local directory first (if exists)
-        if model_dir.exists() and any(model_dir.iterdir()):
-            try:
-                print("Loading from existing local directory...")
-                self.accent_classifier = EncoderClassifier.from_hparams(
-                    source=str(model_dir),
-                    savedir=str(model_dir),
-                )
-                return
-            except Exception as e:
-                print(f"Local loading failed: {e}")
-
-        # Try direct download with temp directory
+    @property
+    def accent_classifier(self) -> EncoderClassifier:
+        """SpeechBrain accent classifier, loaded lazily on first access"""
+        if self._accent_classifier is None:
+            with self._accent_classifier_lock:
+                if self._accent_classifier is None:
+                    print("Loading SpeechBrain accent classifier...")
+                    self._load_accent_classifier()
+                    if self.quantize_accent_model:
+                        self._quantize_accent_classifier()
+                    if self.compile_accent_model:
+                        self._compile_accent_classifier()
+                    print("✓ Accent classifier loaded")
+        return self._accent_classifier
+
+    def _compile_accent_classifier(self):
+        """Compile the ECAPA embedding model with torch.compile (inductor)"""
+        mods = self._accent_classifier.mods
         try:
-            print("Attempting direct download...")
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_model_dir = Path(temp_dir) / "temp_model"
-
-                # Download to temporary directory
-                self.accent_classifier = EncoderClassifier.from_hparams(
-                    source="Jzuluaga/accent-id-commonaccent_ecapa",
-                    savedir=str(temp_model_dir),
+            # dynamic=True: clip lengths vary, avoid one recompile per length
+            mods["embedding_model"] = torch.compile(
+                mods["embedding_model"], backend="inductor", dynamic=True
+            )
+            print("✓ Accent embedding model compiled")
+        except Exception as e:
+            print(f"torch.compile failed, keeping eager model: {e}")
+
+    def _quantize_accent_classifier(self):
+        """Swap the Linear layers of the accent model for dynamic int8 ones
+
+        The stock ECAPA model is convolutional and its head applies F.linear
+        to a bare weight, so there may be nothing to convert; only modules
+        that actually gained int8 layers are swapped in.
+        """
+        mods = self._accent_classifier.mods
+        # Build every quantized module first and swap them in together, so a
+        # failure never leaves the model half-quantized
+        swaps = {}
+        converted = 0
+        try:
+            for name in ("embedding_model", "classifier"):
+                if name not in mods:
+                    continue
+                quantized = torch.ao.quantization.quantize_dynamic(
+                    mods[name], {torch.nn.Linear}, dtype=torch.qint8
                 )
-
-                # Copy from temp to permanent location
-                model_dir.parent.mkdir(parents=True, exist_ok=True)
-                if model_dir.exists():
-                    shutil.rmtree(model_dir)
-                shutil.copytree(temp_model_dir, model_dir)
-
-                print("✓ Model downloaded and copied successfully")
-                return
-
+                count = sum(
+                    isinstance(m, torch.ao.nn.quantized.dynamic.Linear)
+                    for m in quantized.modules()
+                )
+                if count:
+                    swaps[name] = quantized
+                    converted += count
         except Exception as e:
-            print(f"Direct download failed: {e}")
+            print(f"Quantization failed, keeping FP32 model: {e}")
+            return
 
-        # Final fallback: Use HuggingFace Hub directly
-        try:
-            from huggingface_hub import snapshot_download
+        for name, quantized in swaps.items():
+            mods[name] = quantized
+        if converted:
+            print(f"✓ Accent classifier quantized to int8 ({converted} Linear layers)")
+        else:
+            print("Accent classifier has no nn.Linear layers, keeping FP32 model")
 
-            print("Trying HuggingFace Hub direct download...")
+    def _load_accent_classifier(self):
+        """Load the accent classifier straight from the HuggingFace cache"""
+        from huggingface_hub import snapshot_download
+        from huggingface_hub.utils import LocalEntryNotFoundError
 
-            # Download model files manually
+        cache_dir = os.environ["HF_HUB_CACHE"]  # Same cache as set at the top
+        try:
+            # Hot start: weights already cached, no network round trip, no copy
             repo_path = snapshot_download(
-                repo_id="Jzuluaga/accent-id-commonaccent_ecapa", cache_dir="./hf_cache"
+                repo_id=ACCENT_MODEL_REPO, cache_dir=cache_dir, local_files_only=True
             )
+            print("Using cached accent model")
+        except LocalEntryNotFoundError:
+            print("Downloading accent model from HuggingFace Hub...")
+            repo_path = snapshot_download(repo_id=ACCENT_MODEL_REPO, cache_dir=cache_dir)
 
-            # Copy to our model directory
-            model_dir.parent.mkdir(parents=True, exist_ok=True)
-            if model_dir.exists():
-                shutil.rmtree(model_dir)
-            shutil.copytree(repo_path, model_dir)
-
-            # Load the classifier from copied files
-            self.accent_classifier = EncoderClassifier.from_hparams(
-                source=str(model_dir),
-                savedir=str(model_dir),
+        try:
+            # The cache owns the files, SpeechBrain reads them in place
+            self._accent_classifier = EncoderClassifier.from_hparams(
+                source=repo_path,
+                savedir=repo_path,
             )
-            print("✓ Successfully loaded via HuggingFace Hub")
-
         except Exception as e:
-            print(f"HuggingFace Hub download failed: {e}")
             print(f"Full error: {traceback.format_exc()}")
+            raise RuntimeError(
+                f"Failed to load accent classifier. "
+                f"Last error: {e}. "
+                f"Try running as administrator or enable Windows Developer Mode."
+            )
 
-            # Last resort: try simple loading
-            try:
-                print("Trying simple model loading...")
-                self.accent_classifier = EncoderClassifier.from_hparams(
-                    source="Jzuluaga/accent-id-commonaccent_ecapa",
-                    savedir="./pretrained_models/accent_ecapa",
-                )
-                print("✓ Simple loading succeeded")
-            except Exception as final_e:
-                print(f"Simple loading also failed: {final_e}")
-                raise RuntimeError(
-                    f"Failed to load accent classifier after all attempts. "
-                    f"Last error: {final_e}. "
-                    f"Try running as administrator or enable Windows Developer Mode."
-                )
+    def process(
+        self, video_url: str, progress: Callable[[str], None] | None = None
+    ) -> dict:
+        """End-to-end processing: stream audio -> detect -> classify
 
-    def process(self, video_url: str) -> dict:
-        """End-to-end processing: download -> extract -> detect -> classify"""
+        `progress`, if given, is called with a short message at each milestone
+        (from the calling thread) so UIs can show feedback while it runs.
+        """
+        notify = progress or (lambda message: None)
         result = {
             "status": "error",
             "video_url": video_url,
@@ -144,188 +217,190 @@ class AccentDetectionPipeline:
             "accent_confidence_percentage": 0.0,
             "message": "",
             "summary": "",
+            "degraded": False,  # A model failed internally, see _analyze
         }
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_path = os.path.join(tmpdir, "video.mp4")
-            audio_path = os.path.join(tmpdir, "audio.wav")
-            audio_backup_path = os.path.join(tmpdir, "audio_backup.wav")  # Backup copy
+        # Same URL already processed: skip the download entirely
+        cached = self.url_cache.get(video_url)
+        if cached is not None:
+            print(f"✓ Cache hit for URL: {video_url}")
+            return dict(cached)
 
+        audio = None
+        accent_future = None
+        try:
+            # Stream and decode the audio track, the video itself never touches disk
+            print(f"Streaming audio from: {video_url}")
+            notify("📥 Downloading and decoding audio...")
             try:
-                # Download video
-                print(f"Downloading video from: {video_url}")
-                if not download_video(video_url, video_path):
-                    result.update(
-                        message="Video download failed. Check URL or free up disk space."
-                    )
-                    return result
-
-                # Check video file size
-                video_size = os.path.getsize(video_path) / (1024 * 1024)  # MB
-                print(f"✓ Video downloaded ({video_size:.1f} MB)")
+                audio = stream_audio(video_url, pool=self.buffer_pool)
+            except AudioDecodeError as e:
+                result.update(message=f"Audio extraction failed: {e}")
+                return result
+            if audio is None:
+                result.update(
+                    message="Audio extraction failed. Check URL or make sure the video has an audio track."
+                )
+                return result
 
-                # Extract audio
-                print("Extracting audio...")
-                if not extract_audio(video_path, audio_path):
-                    result.update(
-                        message="Audio extraction failed. Video may be corrupted."
-                    )
-                    return result
+            duration = len(audio) / SAMPLE_RATE
+            print(f"✓ Audio decoded ({duration:.1f} seconds)")
 
-                # Check audio file size and properties
-                if not os.path.exists(audio_path):
-                    result.update(message="Audio file not created")
-                    return result
+            if duration < 0.5:
+                result.update(
+                    message="Audio too short - may be silent or corrupted"
+                )
+                return result
 
-                audio_size = os.path.getsize(audio_path) / (1024 * 1024)  # MB
-                print(f"✓ Audio extracted ({audio_size:.1f} MB)")
+            # Identical audio already processed: skip both models
+            # Hash the sample buffer in place, tobytes() would copy the whole clip
+            audio_key = hashlib.sha256(memoryview(audio)).hexdigest()
+            cached = self.audio_cache.get(audio_key)
+            if cached is not None:
+                print("✓ Cache hit for audio content")
+                self.url_cache.put(video_url, dict(cached, video_url=video_url))
+                return dict(cached, video_url=video_url)
+
+            # Decode once, share the same 16kHz waveform between both models
+            waveform = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))
+
+            # The accent model doesn't depend on the language result, so once
+            # loaded it starts speculatively to overlap with Whisper. The
+            # batcher picks it up within milliseconds, so it can't really be
+            # cancelled: non-English clips trade that wasted pass for lower
+            # latency on English ones. Before the first load there is no
+            # speculation, a non-English clip must not trigger the load
+            if self._accent_classifier is not None:
+                accent_future = self._accent_batcher.submit(waveform)
+            result = self._analyze(waveform, accent_future, result, notify)
+
+            # Only clean successes are cached, failures may be transient
+            if result["status"] == "success" and not result["degraded"]:
+                self.audio_cache.put(audio_key, dict(result))
+                self.url_cache.put(video_url, dict(result))
+            return result
 
-                if audio_size < 0.01:  # Less than 10KB
-                    result.update(
-                        message="Audio file too small - may be silent or corrupted"
-                    )
-                    return result
-
-                # Language detection with enhanced debugging
-                print("Detecting language...")
-                lang, lang_prob, all_probs = self._detect_language_detailed(audio_path)
-                result["language"], result["language_confidence"] = lang, lang_prob
-
-                print(f"✓ Language detection results:")
-                print(f"  - Top language: {lang} ({lang_prob:.3f})")
-                print(
-                    f"  - All probabilities: {dict(list(all_probs.items())[:5])}"
-                )  # Top 5
-
-                # If language detection fails, try to force English detection
-                if lang == "unknown" or lang_prob < 0.1:
-                    print(
-                        "⚠️ Language detection uncertain, trying forced English detection..."
-                    )
-                    # Try to detect anyway and see if it's reasonable English
-                    accent_info = self._detect_accent(audio_path)
-                    if accent_info["score"] > 0.3:  # Reasonable confidence
-                        print("✓ Accent detection suggests this might be English")
-                        result.update(
-                            status="success",
-                            language="en",
-                            language_confidence=0.5,  # Moderate confidence
-                            accent=accent_info["name"],
-                            accent_confidence=accent_info["score"],
-                            accent_confidence_percentage=accent_info["percent"],
-                            message="Language detection uncertain, but accent detected",
-                            summary=f"Possibly {accent_info['name']} accent ({accent_info['percent']}% confidence) - language detection was uncertain",
-                        )
-                        return result
-
-                if lang != "en":
-                    result.update(
-                        status="success",
-                        message=f"Non-English audio detected: {lang}",
-                        summary="Accent detection only works for English audio.",
+        except Exception as e:
+            print(f"Pipeline error: {e}")
+            traceback.print_exc()
+            result.update(message=f"Processing failed: {str(e)}")
+            return result
+
+        finally:
+            if audio is not None:
+                if accent_future is None:
+                    self.buffer_pool.release(audio)
+                else:
+                    # A discarded speculative accent run may still be reading
+                    # the buffer, recycle it only once that run has finished
+                    accent_future.add_done_callback(
+                        lambda _: self.buffer_pool.release(audio)
                     )
-                    return result
 
-                # Accent detection
-                print("Detecting accent...")
-                accent_info = self._detect_accent(audio_path)
+    def _analyze(
+        self,
+        waveform: torch.Tensor,
+        accent_future: Future | None,
+        result: dict,
+        notify: Callable[[str], None],
+    ) -> dict:
+        """Run language detection and combine it with the accent result
+
+        `accent_future` is the speculative accent run, if any; without one the
+        accent is only classified when the language calls for it.
+        """
+        # Language detection with enhanced debugging
+        print("Detecting language...")
+        notify(f"🗣️ Detecting language ({len(waveform) / SAMPLE_RATE:.0f}s of audio)...")
+        lang, lang_prob, all_probs = self._detect_language_detailed(waveform)
+        result["language"], result["language_confidence"] = lang, lang_prob
+
+        print(f"✓ Language detection results:")
+        print(f"  - Top language: {lang} ({lang_prob:.3f})")
+        print(
+            f"  - All probabilities: {dict(list(all_probs.items())[:5])}"
+        )  # Top 5
+
+        # "unknown" is what a Whisper error turns into, not a real language
+        if lang == "unknown":
+            result["degraded"] = True
+        uncertain = lang == "unknown" or lang_prob < 0.1
+
+        # One accent result serves both the forced-English and the normal
+        # path; it is only waited for when one of them can use it
+        if uncertain or lang == "en":
+            notify(f"🎯 Language: {lang} ({lang_prob:.0%}), classifying accent...")
+            if accent_future is None:
+                accent_future = self._accent_batcher.submit(waveform)
+            accent_info = accent_future.result()
+            if accent_info["code"] == "unknown":  # ECAPA failed on this batch
+                result["degraded"] = True
+        else:
+            accent_info = None
+
+        # If language detection fails, try to force English detection
+        if uncertain:
+            print(
+                "⚠️ Language detection uncertain, trying forced English detection..."
+            )
+            # Check whether the accent looks like reasonable English
+            if accent_info["score"] > 0.3:  # Reasonable confidence
+                print("✓ Accent detection suggests this might be English")
                 result.update(
                     status="success",
+                    language="en",
+                    language_confidence=0.5,  # Moderate confidence
                     accent=accent_info["name"],
                     accent_confidence=accent_info["score"],
                     accent_confidence_percentage=accent_info["percent"],
-                    message="Processing completed successfully",
-                    summary=f"Detected {accent_info['name']} accent with {accent_info['percent']}% confidence",
+                    message="Language detection uncertain, but accent detected",
+                    summary=f"Possibly {accent_info['name']} accent ({accent_info['percent']}% confidence) - language detection was uncertain",
                 )
-                print(
-                    f"✓ Accent detected: {accent_info['name']} ({accent_info['percent']}%)"
-                )
-                return result
-
-            except Exception as e:
-                print(f"Pipeline error: {e}")
-                traceback.print_exc()
-                result.update(message=f"Processing failed: {str(e)}")
                 return result
 
-    def _detect_language_detailed(self, audio_path: str) -> tuple[str, float, dict]:
-        """Use Whisper to detect language with detailed output - Windows compatible"""
+        if lang != "en":
+            if accent_future is not None:
+                accent_future.cancel()  # Result not needed (no-op once running)
+            result.update(
+                status="success",
+                message=f"Non-English audio detected: {lang}",
+                summary="Accent detection only works for English audio.",
+            )
+            return result
+
+        # Accent detection
+        result.update(
+            status="success",
+            accent=accent_info["name"],
+            accent_confidence=accent_info["score"],
+            accent_confidence_percentage=accent_info["percent"],
+            message="Processing completed successfully",
+            summary=f"Detected {accent_info['name']} accent with {accent_info['percent']}% confidence",
+        )
+        print(
+            f"✓ Accent detected: {accent_info['name']} ({accent_info['percent']}%)"
+        )
+        return result
+
+    def _detect_language_detailed(
+        self, waveform: torch.Tensor
+    ) -> tuple[str, float, dict]:
+        """Use Whisper to detect language with detailed output"""
         try:
-            # Windows-specific fix for Whisper audio loading
-            import numpy as np
-            
-            print(f"Loading audio from: {audio_path}")
-            print(f"File exists: {os.path.exists(audio_path)}")
-            print(f"File size: {os.path.getsize(audio_path)} bytes")
-            
-            # Method 1: Use librosa instead of whisper.load_audio (more reliable on Windows)
-            try:
-                import librosa
-                print("Trying librosa loading...")
-                audio_data, sr = librosa.load(audio_path, sr=16000, mono=True)
-                print(f"Librosa loaded: {len(audio_data)} samples at {sr}Hz")
-                
-                # Convert to the format Whisper expects
-                if len(audio_data) == 0:
-                    raise ValueError("Audio file is empty")
-                    
-                audio = audio_data.astype(np.float32)
-                
-            except Exception as librosa_error:
-                print(f"Librosa failed: {librosa_error}")
-                
-                # Method 2: Copy file to a non-temp location first
-                try:
-                    print("Trying file copy method...")
-                    import shutil
-                    
-                    # Create a copy in the current working directory
-                    temp_audio = os.path.join(os.getcwd(), "temp_audio_whisper.wav")
-                    shutil.copy2(audio_path, temp_audio)
-                    
-                    print(f"Copied to: {temp_audio}")
-                    audio = whisper.load_audio(temp_audio)
-                    
-                    # Clean up
-                    try:
-                        os.remove(temp_audio)
-                    except:
-                        pass
-                        
-                except Exception as copy_error:
-                    print(f"Copy method failed: {copy_error}")
-                    
-                    # Method 3: Use absolute path with forward slashes
-                    try:
-                        print("Trying absolute path conversion...")
-                        abs_path = os.path.abspath(audio_path).replace('\\', '/')
-                        print(f"Converted path: {abs_path}")
-                        audio = whisper.load_audio(abs_path)
-                        
-                    except Exception as abs_error:
-                        print(f"Absolute path method failed: {abs_error}")
-                        raise Exception(f"All audio loading methods failed. Last error: {abs_error}")
-
-            print(f"Audio loaded successfully: {len(audio)} samples = {len(audio)/16000:.1f} seconds")
-            
-            if len(audio) < 16000:  # Less than 1 second
-                raise ValueError("Audio is too short for language detection")
+            print(f"Audio loaded successfully: {len(waveform)} samples = {len(waveform)/SAMPLE_RATE:.1f} seconds")
 
-            # Use the EXACT same approach as your working Colab code
-            audio = whisper.pad_or_trim(audio)  # This is the default 30 seconds
-            mel = whisper.log_mel_spectrogram(
-                audio, n_mels=self.whisper_model.dims.n_mels
-            ).to(self.whisper_model.device)
+            if len(waveform) < SAMPLE_RATE:  # Less than 1 second
+                raise ValueError("Audio is too short for language detection")
 
-            # Get language probabilities
-            _, probs = self.whisper_model.detect_language(mel)
+            # detect_language trims the audio to its own 30s detection window
+            # before computing features, no need to slice here
+            lang, confidence, all_probs = self.whisper_model.detect_language(
+                waveform.numpy()
+            )
+            confidence = float(confidence)
 
             # Sort probabilities
-            sorted_probs = dict(sorted(probs.items(), key=lambda x: x[1], reverse=True))
-
-            # Get the most likely language
-            lang = max(probs, key=probs.get)
-            confidence = float(probs[lang])
+            sorted_probs = dict(sorted(all_probs, key=lambda x: x[1], reverse=True))
 
             print(f"Raw Whisper output - Language: {lang}, Confidence: {confidence:.4f}")
 
@@ -333,55 +408,61 @@ class AccentDetectionPipeline:
 
         except Exception as e:
             print(f"Language detection error: {e}")
-            import traceback
             traceback.print_exc()
             return "unknown", 0.0, {}
 
-    def _detect_language(self, audio_path: str) -> tuple[str, float]:
+    def _detect_language(self, waveform: torch.Tensor) -> tuple[str, float]:
         """Use Whisper to detect language"""
-        lang, conf, _ = self._detect_language_detailed(audio_path)
+        lang, conf, _ = self._detect_language_detailed(waveform)
         return lang, conf
 
-    def _detect_accent(self, audio_path: str) -> dict:
-        """Classify accent and map label - Windows compatible"""
+    def _detect_accent(self, waveform: torch.Tensor) -> dict:
+        """Classify accent and map label (batched with concurrent requests)"""
+        return self._accent_batcher.submit(waveform).result()
+
+    def _detect_accent_batch(self, waveforms: list[torch.Tensor]) -> list[dict]:
+        """Classify a batch of waveforms in a single ECAPA forward pass"""
+        # Load outside the try so a missing model surfaces as a pipeline error
+        classifier = self.accent_classifier
         try:
-            print(f"Detecting accent from: {audio_path}")
-            
-            # Try multiple approaches for Windows compatibility
-            for attempt, path_to_try in enumerate([
-                audio_path,  # Original path
-                os.path.abspath(audio_path),  # Absolute path
-                os.path.abspath(audio_path).replace('\\', '/'),  # Forward slashes
-            ]):
-                try:
-                    print(f"Accent detection attempt {attempt + 1}: {path_to_try}")
-                    
-                    if not os.path.exists(path_to_try) and attempt == 0:
-                        continue
-                        
-                    out_prob, score, index, labels = self.accent_classifier.classify_file(path_to_try)
-                    
-                    code = labels[0] if labels else "unknown"
-                    score_val = float(score[0]) if score.numel() else 0.0
-                    name = self.accent_mapping.get(code, code.title())
-                    
-                    print(f"✓ Accent detection successful: {name} ({score_val:.3f})")
-                    
-                    return {
+            # Zero-pad to the longest clip; relative lengths let SpeechBrain
+            # mask the padding in feature normalisation and pooling
+            if len(waveforms) == 1:
+                wavs = waveforms[0].unsqueeze(0)  # No padding copy needed
+                wav_lens = torch.ones(1)
+            else:
+                lengths = torch.tensor([len(w) for w in waveforms], dtype=torch.float32)
+                wavs = torch.nn.utils.rnn.pad_sequence(waveforms, batch_first=True)
+                wav_lens = lengths / lengths.max()
+
+            # Run the embedding model and classifier head directly on the
+            # in-memory waveforms (same steps as classify_batch, without autograd)
+            with torch.inference_mode():
+                emb = classifier.encode_batch(wavs, wav_lens)
+                out_prob = classifier.mods.classifier(emb).squeeze(1)
+            scores, indices = torch.max(out_prob, dim=-1)
+            labels = classifier.hparams.label_encoder.decode_torch(indices)
+
+            results = []
+            for code, score in zip(labels, scores.tolist()):
+                name = self.accent_mapping.get(code, code.title())
+                print(f"✓ Accent detection successful: {name} ({score:.3f})")
+                results.append(
+                    {
                         "code": code,
                         "name": name,
-                        "score": score_val,
-                        "percent": round(score_val * 100, 1),
+                        "score": score,
+                        "percent": round(score * 100, 1),
                     }
-                    
-                except Exception as e:
-                    print(f"Accent detection attempt {attempt + 1} failed: {e}")
-                    if attempt == 2:  # Last attempt
-                        raise e
-                    continue
-                    
+                )
+            if len(waveforms) > 1:
+                print(f"  (batched {len(waveforms)} requests in one forward pass)")
+            return results
+
         except Exception as e:
             print(f"Accent detection error: {e}")
-            import traceback
             traceback.print_exc()
-            return {"code": "unknown", "name": "Unknown", "score": 0.0, "percent": 0.0}
\ No newline at end of file
+            return [
+                {"code": "unknown", "name": "Unknown", "score": 0.0, "percent": 0.0}
+                for _ in waveforms
+            ]
@@ -1,111 +1,373 @@
+import io
+import json
+import queue
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import BinaryIO
+from urllib.parse import urlparse
+import numpy as np
 import requests
-from moviepy.editor import VideoFileClip
-import os
+import soundfile as sf
 
+SAMPLE_RATE = 16000  # Whisper and the ECAPA classifier both expect 16kHz audio
 
-def download_video(url: str, output_path: str) -> bool:
-    """Download a video from a URL to a local file"""
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB pipe reads/writes
+
+NETWORK_TIMEOUT = 60  # Seconds without data before a fetch is abandoned
+DECODE_TIMEOUT = 600  # Wall-clock bound on a single ffmpeg run
+
+WAV_EXTENSIONS = (".wav", ".wave")
+
+# ffmpeg errors meaning the input couldn't be fetched at all: only these are
+# retried with requests, a stream ffmpeg did read won't decode any better
+FETCH_ERRORS = (
+    "Server returned",
+    "Connection",
+    "timed out",
+    "Failed to resolve",
+    "Network is unreachable",
+    "Input/output error",
+    "Protocol not found",
+    "HTTP error",
+    "TLS",
+    "SSL",
+)
+
+# Containers that commonly carry raw PCM audio; only these are worth an ffprobe
+# round trip (MP4/WebM essentially never hold pcm_s16le)
+PCM_CONTAINER_EXTENSIONS = (".mov", ".mkv", ".avi")
+
+
+def stream_audio(
+    url: str, sample_rate: int = SAMPLE_RATE, pool: "AudioBufferPool | None" = None
+) -> np.ndarray | None:
+    """Decode the audio track of a remote video straight into memory with ffmpeg
+
+    With a pool the samples land in a recycled buffer, the caller hands the
+    returned array back with pool.release() once done with it. Returns None
+    when the URL can't be fetched; raises AudioDecodeError when it was read
+    but holds no usable audio (no audio track, corrupt stream).
+    """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        print(f"Starting download from: {url}")
-        resp = requests.get(url, stream=True, timeout=60, headers=headers)
-        resp.raise_for_status()
-
-        total_size = 0
-        with open(output_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    f.write(chunk)
-                    total_size += len(chunk)
-
-        # Verify file was downloaded
-        if os.path.getsize(output_path) == 0:
-            print("Downloaded file is empty")
-            return False
-
-        print(f"Download completed: {total_size / (1024*1024):.1f} MB")
-        return True
+        print(f"Starting audio stream from: {url}")
+        if urlparse(url).path.lower().endswith(WAV_EXTENSIONS):
+            # Plain WAV files are read with libsndfile, no ffmpeg process at all
+            # when they are already 16kHz mono
+            body = _download(url)
+            audio = _read_wav(body, sample_rate, pool)
+            if audio is not None:
+                print(f"WAV decoded: {len(audio) / sample_rate:.1f} seconds")
+                return audio
+            body.seek(0)
+            pcm = _ffmpeg_decode(["-i", "pipe:0"], sample_rate, source=body)
+        else:
+            # An audio track already stored as 16kHz mono PCM is stream-copied,
+            # skipping the decoder, resampler and encoder
+            copy_audio = urlparse(url).path.lower().endswith(
+                PCM_CONTAINER_EXTENSIONS
+            ) and _is_target_pcm(_probe_audio_stream(url), sample_rate)
+            if copy_audio:
+                print("Audio track is already 16kHz mono PCM, copying it as-is")
+
+            # ffmpeg fetches the URL itself so it can use range requests when the
+            # container needs to seek (e.g. MP4 files with the index at the end)
+            pcm = _ffmpeg_decode(
+                [
+                    "-user_agent",
+                    USER_AGENT,
+                    "-rw_timeout",
+                    str(NETWORK_TIMEOUT * 1_000_000),  # Microseconds
+                    "-i",
+                    url,
+                ],
+                sample_rate,
+                copy_audio=copy_audio,
+            )
+
+        if pcm is None:
+            # Some hosts reject ffmpeg's HTTP client: download with requests
+            # and pipe the bytes into ffmpeg, still without touching the disk
+            print("Retrying with the download piped into ffmpeg...")
+            headers = {"User-Agent": USER_AGENT}
+            with requests.get(
+                url, stream=True, timeout=NETWORK_TIMEOUT, headers=headers
+            ) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                pcm = _ffmpeg_decode(["-i", "pipe:0"], sample_rate, source=resp.raw)
+
+        if pcm is None:
+            return None
+
+        if not pcm:
+            raise AudioDecodeError("No audio track found in video")
+
+        samples = np.frombuffer(pcm, np.int16)
+        audio = _allocate(len(samples), pool)
+        # int16 -> float32 in [-1, 1) in a single pass straight into the output
+        np.multiply(samples, np.float32(1.0 / 32768.0), out=audio, dtype=np.float32)
+        print(f"Audio stream completed: {len(audio) / sample_rate:.1f} seconds")
+        return audio
 
+    except AudioDecodeError as e:
+        print(f"Audio decoding failed: {e}")
+        raise
+    except FileNotFoundError:
+        print("ffmpeg executable not found - make sure FFmpeg is installed")
+        return None
     except Exception as e:
-        print(f"Download error: {e}")
-        return False
+        print(f"Audio streaming error: {e}")
+        return None
 
 
-def extract_audio(video_path: str, audio_path: str) -> bool:
-    """Extract audio track from a video file"""
-    clip = None
+def _probe_audio_stream(url: str) -> dict | None:
+    """Describe the first audio stream of a URL with ffprobe"""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-user_agent",
+        USER_AGENT,
+        "-print_format",
+        "json",
+        "-show_streams",
+        "-select_streams",
+        "a:0",
+        url,
+    ]
     try:
-        print(f"Loading video: {video_path}")
-        clip = VideoFileClip(video_path)
-
-        if clip.audio is None:
-            print("No audio track found in video")
-            return False
-
-        print(f"Video duration: {clip.duration:.1f} seconds")
-        print(f"Audio duration: {clip.audio.duration:.1f} seconds")
-
-        # Extract audio with specific parameters that match Whisper expectations
-        print("Extracting audio...")
-        clip.audio.write_audiofile(
-            audio_path,
-            logger=None,
-            verbose=False,
-            ffmpeg_params=[
-                "-ar",
-                "16000",  # 16kHz sample rate (Whisper default)
-                "-ac",
-                "1",  # Mono channel
-                "-acodec",
-                "pcm_s16le",  # 16-bit PCM
-                "-f",
-                "wav",  # WAV format
-            ],
-        )
-
-        # Close the clip to release resources
-        clip.close()
-        clip = None
+        out = subprocess.run(
+            cmd, capture_output=True, timeout=NETWORK_TIMEOUT, check=True
+        ).stdout
+        streams = json.loads(out).get("streams", [])
+        return streams[0] if streams else None
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        print(f"ffprobe failed: {e}")
+        return None
 
-        # Add a small delay to ensure file is fully written
-        import time
 
-        time.sleep(1.0)
+def _is_target_pcm(stream: dict | None, sample_rate: int) -> bool:
+    """Whether an ffprobe stream is already the PCM format we output"""
+    return (
+        stream is not None
+        and stream.get("codec_name") == "pcm_s16le"
+        and stream.get("sample_rate") == str(sample_rate)
+        and stream.get("channels") == 1
+    )
 
-        # Verify the extracted audio file
-        if not os.path.exists(audio_path):
-            print("Audio file was not created")
-            return False
 
-        audio_size = os.path.getsize(audio_path)
-        if audio_size < 1000:  # Less than 1KB
-            print(f"Audio file too small: {audio_size} bytes")
-            return False
+def _ffmpeg_decode(
+    input_args: list[str],
+    sample_rate: int,
+    source: BinaryIO | None = None,
+    copy_audio: bool = False,
+) -> bytearray | None:
+    """Run ffmpeg and collect 16-bit mono PCM from its stdout
 
-        print(f"Audio extracted successfully: {audio_size / 1024:.1f} KB")
+    Returns None when ffmpeg couldn't fetch the input (worth retrying with
+    another HTTP client) and raises AudioDecodeError for any other failure.
+    """
+    if copy_audio:
+        codec_args = ["-c:a", "copy"]  # Already 16kHz mono s16le
+    else:
+        codec_args = [
+            "-ar",
+            str(sample_rate),  # 16kHz sample rate (Whisper default)
+            "-ac",
+            "1",  # Mono channel
+        ]
+    cmd = [
+        "ffmpeg",
+        "-loglevel",
+        "error",
+        *input_args,
+        "-vn",  # Drop the video stream, only the audio is demuxed
+        *codec_args,
+        "-f",
+        "s16le",  # Raw 16-bit PCM on stdout
+        "pipe:1",
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if source is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
 
-        # Test that we can actually read the file
-        try:
-            with open(audio_path, "rb") as f:
-                f.read(100)  # Try to read first 100 bytes
-            print("Audio file is readable")
-        except Exception as e:
-            print(f"Audio file is not readable: {e}")
-            return False
+    # stdin and stderr are serviced from threads so none of the pipes can fill
+    # up and deadlock while the main thread reads PCM from stdout
+    workers = []
+    feed_errors = []
+    if source is not None:
+        workers.append(
+            threading.Thread(target=_feed, args=(source, proc.stdin, feed_errors))
+        )
+    err = bytearray()
+    workers.append(threading.Thread(target=lambda: err.extend(proc.stderr.read())))
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
 
-        return True
+    # A stalled input must not hold the calling worker thread forever
+    timed_out = threading.Event()
 
-    except Exception as e:
-        print(f"Audio extraction error: {e}")
-        import traceback
+    def _kill():
+        timed_out.set()
+        proc.kill()
 
-        traceback.print_exc()
-        return False
+    watchdog = threading.Timer(DECODE_TIMEOUT, _kill)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        pcm = _read_into_buffer(proc.stdout)
+        proc.wait()
     finally:
-        if clip:
+        watchdog.cancel()
+    for worker in workers:
+        worker.join()
+
+    # Neither is retried: a second attempt would stall or fail the same way,
+    # doubling the time the caller waits
+    if timed_out.is_set():
+        raise AudioDecodeError(f"ffmpeg did not finish within {DECODE_TIMEOUT}s")
+    if feed_errors:
+        # ffmpeg decodes a truncated input just fine, don't trust its exit code
+        raise AudioDecodeError(f"Download failed mid-stream: {feed_errors[0]}")
+    if proc.returncode != 0:
+        message = err.decode(errors="replace").strip()
+        print(f"ffmpeg failed: {message}")
+        if "does not contain any stream" in message:
+            raise AudioDecodeError("No audio track found in video")
+        if any(fragment in message for fragment in FETCH_ERRORS):
+            return None
+        raise AudioDecodeError(f"ffmpeg could not decode the audio: {message}")
+    return pcm
+
+
+def _feed(source: BinaryIO, stdin, errors: list) -> None:
+    """Copy the downloaded bytes into ffmpeg's stdin, recording read errors"""
+    try:
+        while chunk := source.read(CHUNK_SIZE):
             try:
-                clip.close()
-            except:
-                pass
+                stdin.write(chunk)
+            except OSError:
+                return  # ffmpeg exited early (BrokenPipe), its return code tells why
+    except Exception as e:
+        # Any failure reading the source (e.g. urllib3 ProtocolError or
+        # ReadTimeoutError, which aren't OSErrors) means truncated input
+        errors.append(e)
+    finally:
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+
+def _download(url: str) -> io.BytesIO:
+    """Download a (small) file into memory"""
+    headers = {"User-Agent": USER_AGENT}
+    resp = requests.get(url, timeout=NETWORK_TIMEOUT, headers=headers)
+    resp.raise_for_status()
+    return io.BytesIO(resp.content)
+
+
+def _read_wav(
+    body: BinaryIO, sample_rate: int, pool: "AudioBufferPool | None"
+) -> np.ndarray | None:
+    """Decode a WAV already at the target rate in mono, None if it needs ffmpeg"""
+    try:
+        with sf.SoundFile(body) as f:
+            if f.samplerate != sample_rate or f.channels != 1:
+                print(f"WAV is {f.samplerate}Hz/{f.channels}ch, converting with ffmpeg")
+                return None
+            # PCM is scaled to [-1, 1) exactly like the ffmpeg path
+            return f.read(dtype="float32", out=_allocate(f.frames, pool))
+    except sf.LibsndfileError as e:
+        print(f"libsndfile could not read the WAV ({e}), using ffmpeg")
+        return None
+
+
+def _allocate(size: int, pool: "AudioBufferPool | None") -> np.ndarray:
+    """float32 output array, recycled from the pool when there is one"""
+    if pool is not None:
+        return pool.acquire(size)
+    return np.empty(size, np.float32)
+
+
+def _read_into_buffer(stream) -> bytearray:
+    """Read a stream to EOF into a single growing bytearray"""
+    buf = bytearray(CHUNK_SIZE)
+    size = 0
+    while True:
+        if size == len(buf):
+            buf.extend(bytes(len(buf)))  # Double the capacity
+        with memoryview(buf) as view:
+            read = stream.readinto(view[size:])
+        if not read:
+            break
+        size += read
+    del buf[size:]
+    return buf
+
+
+class AudioDecodeError(Exception):
+    """The input was read but no usable audio could be decoded from it"""
+
+
+class LRUCache:
+    """Small thread-safe LRU cache backed by an OrderedDict"""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value (marking it as recently used) or None"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class AudioBufferPool:
+    """Recycles float32 audio buffers so requests don't allocate fresh ones"""
+
+    def __init__(self, max_buffers: int = 4):
+        self._free = queue.LifoQueue(maxsize=max_buffers)
+
+    def acquire(self, size: int) -> np.ndarray:
+        """Return a float32 array of exactly `size` samples (a view of a pooled buffer)"""
+        try:
+            buf = self._free.get_nowait()
+        except queue.Empty:
+            buf = None
+        if buf is None or len(buf) < size:
+            # Too small buffers are dropped, the bigger replacement is kept instead
+            buf = np.empty(size, np.float32)
+        return buf[:size]
+
+    def release(self, audio: np.ndarray) -> None:
+        """Give an array from acquire() back to the pool"""
+        buf = audio.base if audio.base is not None else audio
+        try:
+            self._free.put_nowait(buf)
+        except queue.Full:
+            pass  # Pool is full, let this one be garbage collected